@@ -1,13 +1,23 @@
 # app.py - FastAPI Ocean Data Analysis API
 
 import os
-from fastapi import FastAPI, HTTPException
+import gc
+import logging
+import time
+import asyncio
+import orjson
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
-from typing import Optional
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Annotated, Optional
+from cachetools import Cache, LRUCache, TTLCache
 from backend.analysis_manager import AnalysisManager
 from backend.config import CONFIG
-import traceback
+
+logger = logging.getLogger("ocean_api")
 
 # Import API key configuration
 try:
@@ -20,12 +30,33 @@ except ImportError as e:
     print("Using environment variable if available")
 
 # --- FastAPI App Initialization ---
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Runs the idle-session janitor for the lifetime of the server."""
+    janitor = asyncio.create_task(unload_idle_sessions())
+    yield
+    janitor.cancel()
+
 app = FastAPI(
     title="Ocean LLM API",
     description="Ocean Data Analysis and Chatbot API using ARGO float data",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
 )
 
+# --- Error Handling ---
+# Registered before CORS so that CORS wraps it and 500 responses still carry
+# the CORS headers the frontend needs to read the error detail.
+@app.middleware("http")
+async def handle_unexpected_errors(request: Request, call_next):
+    """Logs unexpected errors once and returns them as a 500 response."""
+    try:
+        return await call_next(request)
+    except Exception as exc:
+        logger.exception("Unhandled error on %s %s", request.method, request.url.path)
+        return ORJSONResponse({"detail": str(exc)}, status_code=500)
+
 # --- CORS Configuration for Frontend Integration ---
 app.add_middleware(
     CORSMiddleware,
@@ -36,105 +67,224 @@ app.add_middleware(
 )
 
 # --- In-memory Session Management ---
-analysis_sessions = {}
+class SessionRegistry(LRUCache):
+    """LRU-capped store of analysed regions; evicted managers are left to the GC."""
+
+    def popitem(self):
+        # Only the registry reference is dropped: in-flight requests may still hold the
+        # manager, and it is freed once they release it
+        region_key, manager = super().popitem()
+        print(f"♻️ Evicting analysis session for {region_key}")
+        return region_key, manager
+
+    def peek(self, region_key, default=None):
+        """Looks up a session without marking it as recently used."""
+        if region_key not in self:
+            return default
+        return Cache.__getitem__(self, region_key)
+
+    def idle_items(self):
+        """Snapshot of (region_key, manager) pairs that leaves the LRU order untouched."""
+        return [(region_key, Cache.__getitem__(self, region_key)) for region_key in list(self)]
+
+# Only regions whose analysis pipeline completed are stored here, so membership
+# doubles as the "initialized" flag checked under the region lock.
+analysis_sessions = SessionRegistry(maxsize=CONFIG["session_settings"]["max_loaded_regions"])
+_region_locks: dict[str, asyncio.Lock] = {}
+
+# Prediction and fishing advice responses keyed by rounded request values.
+# Only read and written from coroutines on the event loop, so no lock is needed.
+_prediction_cache = TTLCache(maxsize=10_000, ttl=300)
+_advice_cache = TTLCache(maxsize=10_000, ttl=300)
+
+# --- Background Work ---
+# Bounded pool for the CPU-heavy pipeline (data fetch + model training) so a
+# burst of cold-region requests cannot spawn unbounded training threads.
+EXECUTOR = ThreadPoolExecutor(max_workers=8)
+
+# Seconds between SSE keep-alive comments while the pipeline is running
+SSE_KEEPALIVE_SECONDS = 15
+
+# Response key -> plot type passed to AnalysisManager.create_visualization
+VISUALIZATION_TYPES = {
+    "geo_map": "geographic_map",
+    "depth_profile": "depth_profile",
+    "time_series": "time_series",
+    "scatter_3d": "scatter_3d"
+}
+
+# --- Static Payloads ---
+# Region names and API info never change at runtime, so build them once.
+AVAILABLE_REGIONS = {key: details["name"] for key, details in CONFIG["regions"].items()}
+
+ROOT_PAYLOAD = {
+    "message": "Ocean LLM API is running!",
+    "available_regions": AVAILABLE_REGIONS,
+    "endpoints": {
+        "chat": "/api/chat",
+        "analyze": "/api/analyze", 
+        "predict": "/api/predict",
+        "fishing_advice": "/api/fishing_advice"
+    }
+}
 
 # --- Pydantic Models ---
-class ChatRequest(BaseModel):
+# Bounds reject out-of-range coordinates before any model work is done
+Latitude = Annotated[float, Field(ge=-90, le=90)]
+Longitude = Annotated[float, Field(ge=-180, le=180)]
+Depth = Annotated[int, Field(ge=0, le=6000)]
+Month = Annotated[int, Field(ge=1, le=12)]
+
+# Enough for a 200 x 200 heatmap grid; caps the (n, 7) feature array a single request can allocate
+MAX_BATCH_POINTS = 40_000
+
+class RequestModel(BaseModel):
+    model_config = ConfigDict(extra='ignore', frozen=True)
+
+class ChatRequest(RequestModel):
     message: str
     region_key: Optional[str] = "arabian_sea"
 
-class AnalysisRequest(BaseModel):
+class AnalysisRequest(RequestModel):
     region_key: str
 
-class PredictionRequest(BaseModel):
+class PredictionRequest(RequestModel):
     region_key: str
-    lat: float
-    lon: float
-    depth: int
-    month: int
+    lat: Latitude
+    lon: Longitude
+    depth: Depth
+    month: Month
 
-class FishingAdviceRequest(BaseModel):
+class PredictionBatchRequest(RequestModel):
     region_key: str
-    lat: float
-    lon: float
-    month: int
+    lats: Annotated[list[Latitude], Field(min_length=1, max_length=MAX_BATCH_POINTS)]
+    lons: Annotated[list[Longitude], Field(min_length=1, max_length=MAX_BATCH_POINTS)]
+    depth: Depth
+    month: Month
+
+class FishingAdviceRequest(RequestModel):
+    region_key: str
+    lat: Latitude
+    lon: Longitude
+    month: Month
 
 # --- Helper Functions ---
-def get_analysis_manager(region_key: str):
+def get_session(region_key: str):
+    """Returns the loaded manager for a region, or None, and marks it as recently used."""
+    manager = analysis_sessions.get(region_key)
+    if manager:
+        manager.touch()
+    return manager
+
+def unload_session(region_key: str) -> bool:
+    """Drops a region's session and releases its memory. Returns False if it wasn't loaded."""
+    manager = analysis_sessions.pop(region_key, None)
+    if not manager:
+        return False
+    manager.close()
+    gc.collect()
+    print(f"♻️ Unloaded analysis session for {region_key}")
+    return True
+
+async def unload_idle_sessions():
+    """Periodically unloads regions that have not been used within the idle timeout."""
+    settings = CONFIG["session_settings"]
+    while True:
+        await asyncio.sleep(settings["janitor_interval_seconds"])
+        now = time.monotonic()
+        for region_key, manager in analysis_sessions.idle_items():
+            if now - manager.last_access > settings["idle_timeout_seconds"]:
+                # Same as LRU eviction: drop the reference without closing the manager
+                analysis_sessions.pop(region_key, None)
+                print(f"♻️ Unloaded idle analysis session for {region_key}")
+
+async def run_analysis(manager):
+    """Runs the analysis pipeline on the bounded executor, off the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(EXECUTOR, manager.run_complete_analysis)
+
+async def build_visualizations(manager):
+    """Builds all visualizations concurrently in worker threads."""
+    results = await asyncio.gather(*[
+        asyncio.to_thread(manager.create_visualization, plot_type)
+        for plot_type in VISUALIZATION_TYPES.values()
+    ])
+    return dict(zip(VISUALIZATION_TYPES.keys(), results))
+
+def format_sse(event: str, data) -> bytes:
+    """Encodes one Server-Sent Events message."""
+    return b"event: " + event.encode() + b"\ndata: " + orjson.dumps(data, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n\n"
+
+async def ensure_manager(region_key: str):
     """
-    Retrieves or creates an analysis manager for a given region.
-    This helps in caching the trained models and data for a session.
+    Returns the analysis manager for a region, running the pipeline on first use.
+    Concurrent cold requests for the same region wait on a per-region lock so the
+    data fetch and model training only happen once. Returns None on failure.
     """
-    if region_key not in analysis_sessions:
-        print(f"Creating new analysis manager for {region_key}")
-        analysis_sessions[region_key] = AnalysisManager(region_key)
-    return analysis_sessions[region_key]
+    # Checked before a lock is created so unknown keys cannot grow _region_locks
+    if region_key not in CONFIG["regions"]:
+        raise HTTPException(status_code=400, detail="Invalid region key")
+    lock = _region_locks.setdefault(region_key, asyncio.Lock())
+    async with lock:
+        if region_key not in analysis_sessions:
+            print(f"Creating new analysis manager for {region_key}")
+            manager = AnalysisManager(region_key)
+            if not await run_analysis(manager):
+                return None
+            analysis_sessions[region_key] = manager
+    manager = analysis_sessions[region_key]
+    manager.touch()
+    return manager
 
 # --- API Routes ---
 
 @app.get("/")
 async def root():
     """Root endpoint with API information."""
-    available_regions = {key: details["name"] for key, details in CONFIG["regions"].items()}
-    return {
-        "message": "Ocean LLM API is running!",
-        "available_regions": available_regions,
-        "endpoints": {
-            "chat": "/api/chat",
-            "analyze": "/api/analyze", 
-            "predict": "/api/predict",
-            "fishing_advice": "/api/fishing_advice"
-        }
-    }
+    return ROOT_PAYLOAD
 
 @app.get("/api/regions")
 async def get_regions():
     """Get available ocean regions for analysis."""
-    available_regions = {key: details["name"] for key, details in CONFIG["regions"].items()}
-    return {"regions": available_regions}
+    return {"regions": AVAILABLE_REGIONS}
 
 @app.post("/api/load_models")
 async def load_models(request: AnalysisRequest):
     """Load and cache models for a specific region."""
-    try:
-        if request.region_key not in CONFIG["regions"]:
-            raise HTTPException(status_code=400, detail="Invalid region key")
-
-        manager = get_analysis_manager(request.region_key)
-        
-        # Check if models are already loaded
-        if manager.predictor.models_trained:
-            return {
-                "status": "already_loaded",
-                "message": f"Models for {manager.region_name} are already loaded and ready",
-                "region": manager.region_name
-            }
-        
-        # Load models by running analysis
-        success = manager.run_complete_analysis()
-        
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to load models for the selected region")
+    if request.region_key not in CONFIG["regions"]:
+        raise HTTPException(status_code=400, detail="Invalid region key")
 
+    # Check if models are already loaded
+    manager = get_session(request.region_key)
+    if manager and manager.predictor.models_trained:
         return {
-            "status": "loaded",
-            "message": f"Models for {manager.region_name} have been successfully loaded",
-            "region": manager.region_name,
-            "summary": manager.get_summary(),
-            "model_metrics": manager.get_model_metrics()
+            "status": "already_loaded",
+            "message": f"Models for {manager.region_name} are already loaded and ready",
+            "region": manager.region_name
         }
+    
+    # Load models by running analysis
+    manager = await ensure_manager(request.region_key)
+    
+    if not manager:
+        raise HTTPException(status_code=500, detail="Failed to load models for the selected region")
 
-    except Exception as e:
-        print(f"Model loading error: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+    return {
+        "status": "loaded",
+        "message": f"Models for {manager.region_name} have been successfully loaded",
+        "region": manager.region_name,
+        "summary": manager.get_summary(),
+        "model_metrics": manager.get_model_metrics()
+    }
 
 @app.get("/api/model_status")
 async def get_model_status():
     """Get the loading status of all region models."""
     status = {}
     for region_key, region_config in CONFIG["regions"].items():
-        if region_key in analysis_sessions:
-            manager = analysis_sessions[region_key]
+        # Status polling must not count as use, or it would reshuffle eviction order
+        manager = analysis_sessions.peek(region_key)
+        if manager is not None:
             status[region_key] = {
                 "name": region_config["name"],
                 "loaded": manager.predictor.models_trained,
@@ -156,25 +306,20 @@ async def get_model_status():
 @app.post("/api/chat")
 async def chat_with_bot(request: ChatRequest):
     """Endpoint to interact with the AI chatbot."""
-    try:
-        manager = get_analysis_manager(request.region_key)
-        
-        # Initialize analysis if not done yet
-        if not manager.chatbot:
-            print("Initializing analysis for chatbot...")
-            success = manager.run_complete_analysis()
-            if not success:
-                raise HTTPException(status_code=500, detail="Failed to initialize ocean data analysis")
+    if request.region_key not in CONFIG["regions"]:
+        raise HTTPException(status_code=400, detail="Invalid region key")
 
-        if not manager.chatbot:
-            raise HTTPException(status_code=400, detail="Chatbot not initialized. Ensure GEMINI_API_KEY is set.")
+    # Initialize analysis if not done yet
+    manager = await ensure_manager(request.region_key)
+    if not manager:
+        raise HTTPException(status_code=500, detail="Failed to initialize ocean data analysis")
 
-        bot_response = manager.chatbot.chat(request.message)
-        return {"response": bot_response, "region": manager.region_name}
+    chatbot = manager.get_chatbot()
+    if not chatbot:
+        raise HTTPException(status_code=400, detail="Chatbot not initialized. Ensure GEMINI_API_KEY is set.")
 
-    except Exception as e:
-        print(f"Chat error: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+    bot_response = await asyncio.to_thread(chatbot.chat, request.message)
+    return {"response": bot_response, "region": manager.region_name}
 
 @app.post("/api/analyze")
 async def analyze_region(request: AnalysisRequest):
@@ -182,34 +327,66 @@ async def analyze_region(request: AnalysisRequest):
     Endpoint to fetch data, train models, and create initial visualizations.
     This is the main long-running task.
     """
-    try:
-        if request.region_key not in CONFIG["regions"]:
-            raise HTTPException(status_code=400, detail="Invalid region key")
+    if request.region_key not in CONFIG["regions"]:
+        raise HTTPException(status_code=400, detail="Invalid region key")
 
-        manager = get_analysis_manager(request.region_key)
-        
-        # Run the complete analysis (fetches data, trains models)
-        success = manager.run_complete_analysis()
+    # Run the complete analysis (fetches data, trains models) once per region
+    manager = await ensure_manager(request.region_key)
 
-        if not success:
-            raise HTTPException(status_code=500, detail="Failed to fetch or process data for the selected region")
+    if not manager:
+        raise HTTPException(status_code=500, detail="Failed to fetch or process data for the selected region")
 
-        # Prepare response data
-        response_data = {
+    # Prepare response data
+    response_data = {
+        "summary": manager.get_summary(),
+        "model_metrics": manager.get_model_metrics(),
+        "visualizations": await build_visualizations(manager)
+    }
+    return response_data
+
+@app.get("/api/analyze/stream")
+async def analyze_region_stream(region_key: str):
+    """
+    Streaming variant of /api/analyze using Server-Sent Events.
+    Emits a 'summary' event once data and models are ready, one 'visualization'
+    event per plot as it finishes, then 'done'. Keep-alive comments are sent
+    while the pipeline runs so proxies do not time out the connection.
+    """
+    if region_key not in CONFIG["regions"]:
+        raise HTTPException(status_code=400, detail="Invalid region key")
+
+    async def event_stream():
+        init_task = asyncio.ensure_future(ensure_manager(region_key))
+        while True:
+            try:
+                manager = await asyncio.wait_for(asyncio.shield(init_task), timeout=SSE_KEEPALIVE_SECONDS)
+                break
+            except asyncio.TimeoutError:
+                yield b": keep-alive\n\n"
+            except Exception as e:
+                logger.exception("Analysis stream failed for %s", region_key)
+                yield format_sse("error", {"detail": str(e)})
+                return
+
+        if not manager:
+            yield format_sse("error", {"detail": "Failed to fetch or process data for the selected region"})
+            return
+
+        yield format_sse("summary", {
             "summary": manager.get_summary(),
-            "model_metrics": manager.get_model_metrics(),
-            "visualizations": {
-                "geo_map": manager.create_visualization('geographic_map'),
-                "depth_profile": manager.create_visualization('depth_profile'),
-                "time_series": manager.create_visualization('time_series'),
-                "scatter_3d": manager.create_visualization('scatter_3d')
-            }
-        }
-        return response_data
+            "model_metrics": manager.get_model_metrics()
+        })
+
+        async def build(name, plot_type):
+            return name, await asyncio.to_thread(manager.create_visualization, plot_type)
 
-    except Exception as e:
-        print(f"Analysis error: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+        for next_plot in asyncio.as_completed([build(name, plot_type) for name, plot_type in VISUALIZATION_TYPES.items()]):
+            name, figure = await next_plot
+            yield format_sse("visualization", {"name": name, "figure": figure})
+
+        yield format_sse("done", {})
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream")
 
 @app.post("/api/visualizations")
 async def get_visualizations(request: AnalysisRequest):
@@ -217,95 +394,117 @@ async def get_visualizations(request: AnalysisRequest):
     Endpoint to get visualizations for already loaded models.
     This does NOT retrain models - only creates visualizations from cached data.
     """
-    try:
-        if request.region_key not in CONFIG["regions"]:
-            raise HTTPException(status_code=400, detail="Invalid region key")
-
-        manager = get_analysis_manager(request.region_key)
-        
-        # Check if models are loaded
-        if not manager.predictor.models_trained:
-            raise HTTPException(status_code=400, detail="Models for this region are not loaded yet. Please load models first.")
+    if request.region_key not in CONFIG["regions"]:
+        raise HTTPException(status_code=400, detail="Invalid region key")
 
-        # Check if we have data
-        if manager.df.empty:
-            raise HTTPException(status_code=400, detail="No data available for this region. Please load models first.")
-
-        # Create visualizations from existing data
-        response_data = {
-            "summary": manager.get_summary(),
-            "model_metrics": manager.get_model_metrics(),
-            "visualizations": {
-                "geo_map": manager.create_visualization('geographic_map'),
-                "depth_profile": manager.create_visualization('depth_profile'),
-                "time_series": manager.create_visualization('time_series'),
-                "scatter_3d": manager.create_visualization('scatter_3d')
-            }
-        }
-        return response_data
-
-    except Exception as e:
-        print(f"Visualization error: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+    manager = get_session(request.region_key)
+    
+    # Check if models are loaded
+    if not manager or not manager.predictor.models_trained:
+        raise HTTPException(status_code=400, detail="Models for this region are not loaded yet. Please load models first.")
+
+    # Check if we have data
+    if manager.df.empty:
+        raise HTTPException(status_code=400, detail="No data available for this region. Please load models first.")
+
+    # Create visualizations from existing data
+    response_data = {
+        "summary": manager.get_summary(),
+        "model_metrics": manager.get_model_metrics(),
+        "visualizations": await build_visualizations(manager)
+    }
+    return response_data
 
 @app.post("/api/predict")
 async def predict_conditions(request: PredictionRequest):
     """Endpoint to get predictions for a specific point."""
-    try:
-        manager = get_analysis_manager(request.region_key)
+    manager = get_session(request.region_key)
+
+    if not manager or not manager.predictor.models_trained:
+        raise HTTPException(status_code=400, detail="Models for this region are not trained yet. Please run analysis first.")
+
+    # Rounding to 3 decimals (~100 m) collapses near-duplicate map queries
+    cache_key = (request.region_key, round(request.lat, 3), round(request.lon, 3), request.depth, request.month)
+    if cache_key in _prediction_cache:
+        return _prediction_cache[cache_key]
+
+    predictions = await asyncio.to_thread(
+        manager.predictor.predict, request.lat, request.lon, request.depth, request.month
+    )
+    _prediction_cache[cache_key] = predictions
+    return predictions
 
-        if not manager.predictor.models_trained:
-            raise HTTPException(status_code=400, detail="Models for this region are not trained yet. Please run analysis first.")
+@app.post("/api/predict_batch")
+async def predict_conditions_batch(request: PredictionBatchRequest):
+    """Endpoint to get predictions for many points at one depth and month (e.g. map grids)."""
+    if len(request.lats) != len(request.lons):
+        raise HTTPException(status_code=400, detail="lats and lons must have the same length")
 
-        predictions = manager.predictor.predict(request.lat, request.lon, request.depth, request.month)
-        return predictions
+    manager = get_session(request.region_key)
 
-    except Exception as e:
-        print(f"Prediction error: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if not manager or not manager.predictor.models_trained:
+        raise HTTPException(status_code=400, detail="Models for this region are not trained yet. Please run analysis first.")
+
+    predictions = await asyncio.to_thread(
+        manager.predictor.predict_batch, request.lats, request.lons, request.depth, request.month
+    )
+    return predictions
 
 @app.post("/api/fishing_advice")
 async def get_fishing_advice(request: FishingAdviceRequest):
     """Endpoint for the Fishing Advisor."""
-    try:
-        manager = get_analysis_manager(request.region_key)
-
-        if not manager.fishing_advisor:
-            raise HTTPException(status_code=400, detail="Fishing advisor not available. Please run analysis first.")
-        
-        advice = manager.fishing_advisor.get_fishing_advice(request.lat, request.lon, request.month)
-        return {"advice": advice}
-        
-    except Exception as e:
-        print(f"Fishing advice error: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+    manager = get_session(request.region_key)
+
+    fishing_advisor = manager.get_fishing_advisor() if manager else None
+    if not fishing_advisor:
+        raise HTTPException(status_code=400, detail="Fishing advisor not available. Please run analysis first.")
+    
+    cache_key = (request.region_key, round(request.lat, 3), round(request.lon, 3), request.month)
+    if cache_key in _advice_cache:
+        return _advice_cache[cache_key]
+
+    advice = await asyncio.to_thread(
+        fishing_advisor.get_fishing_advice, request.lat, request.lon, request.month
+    )
+    _advice_cache[cache_key] = {"advice": advice}
+    return _advice_cache[cache_key]
+
+@app.post("/api/unload")
+async def unload_region(request: AnalysisRequest):
+    """Unload a region's data and models from memory. Cached files on disk are kept."""
+    if request.region_key not in CONFIG["regions"]:
+        raise HTTPException(status_code=400, detail="Invalid region key")
+
+    unloaded = unload_session(request.region_key)
+    return {
+        "status": "unloaded" if unloaded else "not_loaded",
+        "region_key": request.region_key
+    }
 
 # --- Health Check ---
 @app.post("/api/clear_cache")
 async def clear_cache(request: AnalysisRequest):
     """Clear cached data for a specific region."""
-    try:
-        if request.region_key not in CONFIG["regions"]:
-            raise HTTPException(status_code=400, detail="Invalid region key")
-        
-        # Clear cache
-        from backend.data_cache import DataCache
-        cache = DataCache(request.region_key)
-        cache.clear_cache()
-        
-        # Clear analysis session if exists
-        if request.region_key in analysis_sessions:
-            del analysis_sessions[request.region_key]
-        
-        return {
-            "status": "success",
-            "message": f"Cache cleared for {CONFIG['regions'][request.region_key]['name']}",
-            "region_key": request.region_key
-        }
-        
-    except Exception as e:
-        print(f"Cache clear error: {traceback.format_exc()}")
-        raise HTTPException(status_code=500, detail=str(e))
+    if request.region_key not in CONFIG["regions"]:
+        raise HTTPException(status_code=400, detail="Invalid region key")
+    
+    # Clear cache
+    from backend.data_cache import DataCache
+    cache = DataCache(request.region_key)
+    cache.clear_cache()
+    
+    # Clear analysis session if exists
+    unload_session(request.region_key)
+
+    # Drop cached responses served from the cleared session
+    _prediction_cache.clear()
+    _advice_cache.clear()
+    
+    return {
+        "status": "success",
+        "message": f"Cache cleared for {CONFIG['regions'][request.region_key]['name']}",
+        "region_key": request.region_key
+    }
 
 @app.get("/health")
 async def health_check():
@@ -315,10 +514,21 @@ async def health_check():
 # --- Main Application Runner ---
 if __name__ == '__main__':
     import uvicorn
+    from importlib.util import find_spec
     
     # Set the GEMINI_API_KEY from an environment variable for security
     if not os.environ.get('GEMINI_API_KEY'):
         print("⚠️  WARNING: GEMINI_API_KEY environment variable not set. Chatbot will not function.")
     
     print("🌊 Starting Ocean LLM FastAPI server...")
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+    # Region sessions live in process memory, so each extra worker holds its own copy
+    # of the loaded data and models. Set DEV=1 for auto-reload during development.
+    uvicorn.run(
+        "app:app",
+        host="0.0.0.0",
+        port=8000,
+        loop="uvloop" if find_spec("uvloop") else "asyncio",
+        http="httptools" if find_spec("httptools") else "h11",
+        workers=int(os.environ.get("WORKERS", "1")),
+        reload=bool(os.environ.get("DEV"))
+    )
\ No newline at end of file
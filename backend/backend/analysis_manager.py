@@ -1,10 +1,18 @@
 # /backend/analysis_manager.py
 
 import os
+import time
+from itertools import islice
+import numpy as np
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
 from .config import CONFIG
 from .data_fetcher import EnhancedArgoDataFetcher
 from .predictor import AdvancedOceanPredictor
@@ -12,6 +20,9 @@ from .chatbot import OceanChatbot
 from .assistants import FishingAdvisor, ResearchAssistant
 from .data_cache import DataCache
 
+# profile_id = float code * stride + cycle number; Argo cycle numbers stay well below this
+PROFILE_ID_STRIDE = 100_000
+
 class AnalysisManager:
     """Manages the complete analysis pipeline for a specific region."""
 
@@ -26,14 +37,23 @@ class AnalysisManager:
         
         self.df = pd.DataFrame()
         self.summary = {}
+        self._viz_cache: dict[str, str] = {}
+        self._profile_groups = None
+        self._profile_sizes = pd.Series(dtype='int64')
+        self._viz_df = pd.DataFrame()
+        self._surface_df = pd.DataFrame()
+        self._surface_daily = pd.DataFrame()
+        self._surface_monthly = pd.DataFrame()
         self.data_fetcher = EnhancedArgoDataFetcher()
         self.data_cache = DataCache(region_key)
         self.predictor = AdvancedOceanPredictor(
             region_key, CONFIG["model_settings"]["model_preference"]
         )
-        self.chatbot = None
-        self.fishing_advisor = None
-        self.research_assistant = None
+        # Assistants are created on first use, see get_chatbot() and friends
+        self._chatbot = None
+        self._fishing_advisor = None
+        self._research_assistant = None
+        self.last_access = time.monotonic()
 
     def run_complete_analysis(self):
         """Runs the full pipeline: fetch, process, and train models."""
@@ -50,6 +70,7 @@ class AnalysisManager:
             print("📂 Using cached data.")
             self.df = cached_df
             self.summary = cached_summary
+            self._index_data()
         else:
             # 3. Fetch and process new data
             if not self._fetch_and_process_data():
@@ -60,9 +81,6 @@ class AnalysisManager:
         # 4. If models weren't loaded, train them
         if not self.predictor.models_trained:
             self.predictor.train_models(self.df)
-
-        # 5. Initialize assistants and chatbot
-        self._initialize_assistants()
         
         print(f"✅ Analysis pipeline completed for {self.region_name}.")
         return True
@@ -78,51 +96,122 @@ class AnalysisManager:
             print("❌ No data could be fetched for analysis.")
             return False
         
-        # Standardize and clean data
-        df = raw_df.copy()
+        # Standardize and clean data (project columns first so only one copy is made)
         column_map = {'PLATFORM_NUMBER': 'float_id', 'CYCLE_NUMBER': 'cycle_number', 
                       'TIME': 'date', 'LATITUDE': 'latitude', 'LONGITUDE': 'longitude', 
                       'PRES': 'depth', 'TEMP': 'temperature', 'PSAL': 'salinity'}
-        df = df.rename(columns=column_map)
-        df = df[list(column_map.values())].dropna(subset=['latitude', 'longitude', 'depth', 'temperature', 'salinity'])
+        df = raw_df[list(column_map.keys())].rename(columns=column_map)
+        numeric_cols = ['latitude', 'longitude', 'depth', 'temperature', 'salinity']
+        df.dropna(subset=numeric_cols, inplace=True)
+        
+        # Measurements fit comfortably in float32, halving memory for every later pass.
+        # They are kept as one column-major block so each column is contiguous and
+        # sorts/filters take all five in a single pass.
+        measurements = np.asfortranarray(df[numeric_cols].to_numpy(dtype='float32'))
+        df = pd.concat([df.drop(columns=numeric_cols),
+                        pd.DataFrame(measurements, columns=numeric_cols, index=df.index)], axis=1)
+        
+        df['date'] = pd.to_datetime(df['date'], format='ISO8601', cache=True)
+        df['month'] = df['date'].dt.month.astype('int8')
+        df['year'] = df['date'].dt.year.astype('int16')
+        # Float ids repeat for every level of every cycle; store them once as categories.
+        # Integer profile key (float, cycle); readable labels are only built for plotted rows
+        df['float_id'] = df['float_id'].astype('category')
+        float_codes = df['float_id'].cat.codes.to_numpy(dtype='int64')
+        df['profile_id'] = float_codes * PROFILE_ID_STRIDE + df['cycle_number'].to_numpy(dtype='int64')
         
-        df['date'] = pd.to_datetime(df['date'])
-        df['month'] = df['date'].dt.month
-        df['year'] = df['date'].dt.year
-        df['profile_id'] = df['float_id'].astype(str) + '_' + df['cycle_number'].astype(str)
+        # Sort once so every per-profile slice is already ordered by depth
+        df.sort_values(['profile_id', 'depth'], inplace=True, kind='mergesort')
+        df.reset_index(drop=True, inplace=True)
         self.df = df
+        self._index_data()
         
         self._create_summary()
         return True
 
+    def _index_data(self):
+        """Precomputes per-profile groups and surface aggregates, and drops stale plots."""
+        self._viz_cache.clear()
+        self._profile_groups = self.df.groupby('profile_id', sort=False)
+        self._profile_sizes = self._profile_groups.size()
+        self._surface_df = self.df[self.df['depth'] <= 10]
+        surface_series = self._surface_df[['date', 'temperature', 'salinity']].set_index('date').sort_index()
+        self._surface_daily = surface_series.resample('D').mean().reset_index()
+        self._surface_monthly = surface_series.resample('MS').mean().reset_index()
+        
+        # Spatially thinned plotting sample: one row per 0.1° x 0.1° x 50 m bin
+        bins = [self.df['latitude'].round(1), self.df['longitude'].round(1), self.df['depth'] // 50]
+        viz_df = self.df.groupby(bins, sort=False).head(1)
+        viz_sample_size = CONFIG["data_settings"]["sample_size_for_viz"]
+        if len(viz_df) > viz_sample_size:
+            viz_df = viz_df.sample(n=viz_sample_size, random_state=42)
+        elif len(viz_df) < 20:
+            # Too few distinct bins for the map and 3D plots; fall back to a plain random sample
+            viz_df = self.df.sample(n=min(200, len(self.df)), random_state=42)
+        self._viz_df = viz_df
+
     def _create_summary(self):
         """Creates a summary dictionary from the processed data."""
         if self.df.empty: return
-        surface_df = self.df[self.df['depth'] <= 10]
+        # One reduction per frame: both surface means together, date range in one agg
+        surface_means = self._surface_df[['temperature', 'salinity']].mean()
+        has_surface = not self._surface_df.empty
+        date_min, date_max = self.df['date'].agg(['min', 'max'])
         self.summary = {
             'region': self.region_name,
             'num_profiles': self.df['profile_id'].nunique(),
             'num_floats': self.df['float_id'].nunique(),
-            'date_range': f"{self.df['date'].min().strftime('%Y-%m-%d')} to {self.df['date'].max().strftime('%Y-%m-%d')}",
-            'avg_surface_temp_C': f"{surface_df['temperature'].mean():.2f}" if not surface_df.empty else 'N/A',
-            'avg_surface_salinity_PSU': f"{surface_df['salinity'].mean():.2f}" if not surface_df.empty else 'N/A',
+            'date_range': f"{date_min.strftime('%Y-%m-%d')} to {date_max.strftime('%Y-%m-%d')}",
+            'avg_surface_temp_C': f"{surface_means['temperature']:.2f}" if has_surface else 'N/A',
+            'avg_surface_salinity_PSU': f"{surface_means['salinity']:.2f}" if has_surface else 'N/A',
             'deepest_point_m': f"{self.df['depth'].max():.0f}"
         }
 
-    def _initialize_assistants(self):
-        """Initializes chatbot and other assistant tools."""
-        if self.predictor.models_trained:
-            self.fishing_advisor = FishingAdvisor(self.predictor)
-        self.research_assistant = ResearchAssistant(self.df)
-        
-        if os.environ.get('GEMINI_API_KEY'):
+    def get_chatbot(self):
+        """Returns the chatbot, creating it on first use. None without an API key."""
+        if self._chatbot is None:
+            if not os.environ.get('GEMINI_API_KEY'):
+                print("Chatbot skipped (no API key).")
+                return None
             try:
-                self.chatbot = OceanChatbot(predictor=self.predictor, data_summary=self.summary)
+                self._chatbot = OceanChatbot(predictor=self.predictor, data_summary=self.summary)
                 print("✅ Chatbot initialized.")
             except Exception as e:
                 print(f"⚠️ Could not initialize chatbot: {e}")
-        else:
-            print("Chatbot skipped (no API key).")
+        return self._chatbot
+
+    def get_fishing_advisor(self):
+        """Returns the fishing advisor, creating it on first use. None until models are trained."""
+        if self._fishing_advisor is None and self.predictor.models_trained:
+            self._fishing_advisor = FishingAdvisor(self.predictor)
+        return self._fishing_advisor
+
+    def get_research_assistant(self):
+        """Returns the research assistant, creating it on first use."""
+        if self._research_assistant is None:
+            self._research_assistant = ResearchAssistant(self.df)
+        return self._research_assistant
+
+    def touch(self):
+        """Records that the session was just used (read by the idle-session janitor)."""
+        self.last_access = time.monotonic()
+
+    def close(self):
+        """Drops data, models and assistants so an evicted session can be reclaimed."""
+        self.df = pd.DataFrame()
+        self._viz_cache.clear()
+        self._profile_groups = None
+        self._profile_sizes = pd.Series(dtype='int64')
+        self._viz_df = pd.DataFrame()
+        self._surface_df = pd.DataFrame()
+        self._surface_daily = pd.DataFrame()
+        self._surface_monthly = pd.DataFrame()
+        self.predictor.models = {}
+        self.predictor.scalers = {}
+        self.predictor.models_trained = False
+        self._chatbot = None
+        self._fishing_advisor = None
+        self._research_assistant = None
 
     def get_summary(self):
         return self.summary
@@ -130,37 +219,68 @@ class AnalysisManager:
     def get_model_metrics(self):
         return self.predictor.model_metrics
 
+    @staticmethod
+    def _plot_values(series, decimals):
+        """Rounded float array for a trace; avoids float32 widening to long decimals in JSON."""
+        return series.to_numpy(dtype='float64').round(decimals)
+
+    @staticmethod
+    def _figure_json(fig):
+        """Serializes a figure with orjson directly, skipping Plotly's JSON encoder when possible."""
+        if not ORJSON_AVAILABLE:
+            return fig.to_json()
+        try:
+            return orjson.dumps(fig.to_plotly_json(), option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        except TypeError:
+            # e.g. numpy object arrays; Plotly's encoder cleans those up first
+            return fig.to_json(engine='orjson')
+
     def create_visualization(self, plot_type):
-        """Creates a specific interactive visualization and returns its JSON."""
+        """
+        Creates a specific interactive visualization and returns its JSON.
+        Only reads the prepared frames, so different plot types can be built
+        concurrently from worker threads.
+        """
         if self.df.empty: return None
+        if plot_type in self._viz_cache:
+            return self._viz_cache[plot_type]
         
-        # Sample data for performance
-        viz_sample_size = CONFIG["data_settings"]["sample_size_for_viz"]
-        df_sample = self.df.sample(n=min(viz_sample_size, len(self.df)), random_state=42)
+        # Spatially binned sample prepared once per dataset
+        df_sample = self._viz_df
 
         try:
             if plot_type == 'geographic_map':
-                # Ensure we have enough data points for visualization
-                if len(df_sample) < 10:
-                    df_sample = self.df.sample(n=min(100, len(self.df)), random_state=42)
-                
-                fig = px.scatter_mapbox(
-                    df_sample, 
-                    lat="latitude", 
-                    lon="longitude", 
-                    color="temperature", 
-                    size="depth",
-                    mapbox_style="open-street-map", 
-                    zoom=4,
-                    title=f"ARGO Float Distribution - {self.region_name}",
-                    color_continuous_scale=px.colors.sequential.Viridis,
-                    hover_name="profile_id", 
-                    hover_data={"salinity": ":.2f", "date": "|%Y-%m-%d", "depth": ":.0f"},
-                    size_max=20
-                )
+                depth = self._plot_values(df_sample['depth'], 0)
+                # Hover labels live in the template; per point only the values are sent.
+                # Plain lists, since orjson cannot serialize numpy object arrays.
+                hover_data = np.column_stack([
+                    self._plot_values(df_sample['salinity'], 2),
+                    df_sample['date'].dt.strftime('%Y-%m-%d').to_numpy()
+                ]).tolist()
+                fig = go.Figure(go.Scattermapbox(
+                    lat=self._plot_values(df_sample['latitude'], 3),
+                    lon=self._plot_values(df_sample['longitude'], 3),
+                    mode='markers',
+                    marker=dict(
+                        color=self._plot_values(df_sample['temperature'], 2),
+                        colorscale='Viridis',
+                        colorbar=dict(title='Temp (°C)'),
+                        size=depth,
+                        sizemode='area',
+                        sizeref=2 * max(float(depth.max()), 1) / 20 ** 2
+                    ),
+                    text=(df_sample['float_id'].astype(str) + '_' + df_sample['cycle_number'].astype(str)).tolist(),
+                    customdata=hover_data,
+                    hovertemplate=('<b>%{text}</b><br>Temp: %{marker.color:.2f} °C<br>Salinity: %{customdata[0]:.2f} PSU'
+                                   '<br>Depth: %{marker.size:.0f} m<br>Date: %{customdata[1]}'
+                                   '<br>Lat: %{lat:.2f}, Lon: %{lon:.2f}<extra></extra>')
+                ))
                 fig.update_layout(
+                    title=f"ARGO Float Distribution - {self.region_name}",
                     margin={"r":0,"t":40,"l":0,"b":0},
                     mapbox=dict(
+                        style="open-street-map",
+                        zoom=4,
                         center=dict(
                             lat=df_sample['latitude'].mean(),
                             lon=df_sample['longitude'].mean()
@@ -169,21 +289,23 @@ class AnalysisManager:
                 )
 
             elif plot_type == 'depth_profile':
-                sample_profiles = df_sample['profile_id'].unique()[:8]  # Show 8 profiles
+                # Show 8 profiles with more than 3 levels; rows are already sorted by depth
+                sample_profiles = islice(
+                    (pid for pid in df_sample['profile_id'].unique() if self._profile_sizes[pid] > 3), 8
+                )
                 fig = go.Figure()
                 colors = px.colors.qualitative.Set1
                 
                 for i, pid in enumerate(sample_profiles):
-                    profile_data = self.df[self.df['profile_id'] == pid].sort_values('depth')
-                    if len(profile_data) > 3:
-                        fig.add_trace(go.Scatter(
-                            x=profile_data['temperature'], 
-                            y=profile_data['depth'], 
-                            mode='lines+markers', 
-                            name=f'Profile {pid.split("_")[-1]}',
-                            line=dict(color=colors[i % len(colors)], width=2),
-                            marker=dict(size=4)
-                        ))
+                    profile_data = self._profile_groups.get_group(pid)
+                    fig.add_trace(go.Scatter(
+                        x=self._plot_values(profile_data['temperature'], 2), 
+                        y=self._plot_values(profile_data['depth'], 0), 
+                        mode='lines+markers', 
+                        name=f'Profile {pid % PROFILE_ID_STRIDE}',
+                        line=dict(color=colors[i % len(colors)], width=2),
+                        marker=dict(size=4)
+                    ))
                 
                 fig.update_layout(
                     title='Temperature Depth Profiles',
@@ -196,18 +318,19 @@ class AnalysisManager:
             
             elif plot_type == 'time_series':
                 # Create time series with more data points
-                surface_data = self.df[self.df['depth'] <= 10].groupby(pd.Grouper(key='date', freq='D')).mean().reset_index()
+                surface_data = self._surface_daily
                 
-                # If we don't have enough daily data, create monthly averages
+                # If we don't have enough daily data, use monthly averages
                 if len(surface_data) < 5:
-                    surface_data = self.df[self.df['depth'] <= 10].groupby(pd.Grouper(key='date', freq='M')).mean().reset_index()
+                    surface_data = self._surface_monthly
                 
+                dates = surface_data['date'].to_numpy()
                 fig = make_subplots(specs=[[{"secondary_y": True}]])
                 
                 # Temperature trace
                 fig.add_trace(go.Scatter(
-                    x=surface_data['date'], 
-                    y=surface_data['temperature'], 
+                    x=dates, 
+                    y=self._plot_values(surface_data['temperature'], 2), 
                     name='Temperature (°C)',
                     mode='lines+markers',
                     line=dict(color='red', width=2),
@@ -216,8 +339,8 @@ class AnalysisManager:
                 
                 # Salinity trace
                 fig.add_trace(go.Scatter(
-                    x=surface_data['date'], 
-                    y=surface_data['salinity'], 
+                    x=dates, 
+                    y=self._plot_values(surface_data['salinity'], 2), 
                     name='Salinity (PSU)',
                     mode='lines+markers',
                     line=dict(color='blue', width=2),
@@ -234,24 +357,26 @@ class AnalysisManager:
                 fig.update_yaxes(title_text="Salinity (PSU)", secondary_y=True)
 
             elif plot_type == 'scatter_3d':
-                # Ensure we have enough data for 3D visualization
-                if len(df_sample) < 20:
-                    df_sample = self.df.sample(n=min(200, len(self.df)), random_state=42)
-                
-                fig = px.scatter_3d(
-                    df_sample, 
-                    x='longitude', 
-                    y='latitude', 
-                    z='depth', 
-                    color='temperature',
-                    title='3D Ocean Data Visualization',
-                    labels={'depth': 'Depth (m)', 'temperature': 'Temp (°C)', 'longitude': 'Longitude', 'latitude': 'Latitude'},
-                    color_continuous_scale=px.colors.sequential.Viridis,
-                    size='salinity',
-                    size_max=8,
-                    opacity=0.7
-                )
+                salinity = self._plot_values(df_sample['salinity'], 2)
+                fig = go.Figure(go.Scatter3d(
+                    x=self._plot_values(df_sample['longitude'], 3),
+                    y=self._plot_values(df_sample['latitude'], 3),
+                    z=self._plot_values(df_sample['depth'], 0),
+                    mode='markers',
+                    marker=dict(
+                        color=self._plot_values(df_sample['temperature'], 2),
+                        colorscale='Viridis',
+                        colorbar=dict(title='Temp (°C)'),
+                        size=salinity,
+                        sizemode='area',
+                        sizeref=2 * max(float(salinity.max()), 1) / 8 ** 2,
+                        opacity=0.7
+                    ),
+                    hovertemplate=('Longitude: %{x:.2f}<br>Latitude: %{y:.2f}<br>Depth: %{z:.0f} m'
+                                   '<br>Temp: %{marker.color:.2f} °C<extra></extra>')
+                ))
                 fig.update_layout(
+                    title='3D Ocean Data Visualization',
                     scene=dict(
                         zaxis=dict(autorange='reversed'),
                         xaxis_title='Longitude',
@@ -264,7 +389,8 @@ class AnalysisManager:
             else:
                 return None
             
-            return fig.to_json()
+            self._viz_cache[plot_type] = self._figure_json(fig)
+            return self._viz_cache[plot_type]
         except Exception as e:
             print(f"Error creating visualization '{plot_type}': {e}")
             return None
\ No newline at end of file
@@ -1,3 +1,6 @@
+import numpy as np
+import pandas as pd
+
 class FishingAdvisor:
     """Specialized advisor for fishing communities."""
     
@@ -12,26 +15,27 @@ class FishingAdvisor:
         depths_to_check = [10, 50, 100, 200]
         advice = f"🎣 Fishing Conditions Report for {lat:.2f}°N, {lon:.2f}°E in Month {month}:\n\n"
         
-        for depth in depths_to_check:
-            try:
-                conditions = self.predictor.predict(lat, lon, depth, month)
-                temp = conditions.get('predicted_temperature', 'N/A')
-                
-                advice += f"📏 Depth {depth}m:\n"
-                advice += f"   🌡️ Predicted Temperature: {temp}°C\n"
-                
-                if isinstance(temp, (int, float)):
-                    if 24 < temp < 30:
-                        advice += "   🐟 Good for: Tuna, Marlin, Dolphinfish. ✅ Recommended fishing depth.\n\n"
-                    elif 20 < temp <= 24:
-                        advice += "   🐟 Good for: Mackerel, Sardines, Anchovies. ⚡ Moderate conditions.\n\n"
-                    else:
-                        advice += "   🐟 Good for: Deep-water species. ❄️ Cool water fishing.\n\n"
+        # One batched model call covers every depth
+        try:
+            predictions = self.predictor.predict_batch(lat, lon, depths_to_check, month)
+            temps = predictions.get('predicted_temperature', ['N/A'] * len(depths_to_check))
+        except Exception as e:
+            advice += f"   ❌ Could not analyze depths {depths_to_check}: {e}\n\n"
+            temps = []
+        
+        for depth, temp in zip(depths_to_check, temps):
+            advice += f"📏 Depth {depth}m:\n"
+            advice += f"   🌡️ Predicted Temperature: {temp}°C\n"
+            
+            if isinstance(temp, (int, float)):
+                if 24 < temp < 30:
+                    advice += "   🐟 Good for: Tuna, Marlin, Dolphinfish. ✅ Recommended fishing depth.\n\n"
+                elif 20 < temp <= 24:
+                    advice += "   🐟 Good for: Mackerel, Sardines, Anchovies. ⚡ Moderate conditions.\n\n"
                 else:
-                    advice += "   Could not determine recommendation.\n\n"
-                    
-            except Exception as e:
-                advice += f"   ❌ Could not analyze depth {depth}m: {e}\n\n"
+                    advice += "   🐟 Good for: Deep-water species. ❄️ Cool water fishing.\n\n"
+            else:
+                advice += "   Could not determine recommendation.\n\n"
         
         advice += "💡 General Tip: Best fishing times are often early morning and late evening."
         return advice
@@ -48,16 +52,21 @@ class ResearchAssistant:
             return "No data available for water mass analysis."
         
         analysis = "🌊 Water Mass Analysis:\n\n"
-        water_masses = {
-            "Surface Water (0-100m)": self.df[self.df['depth'] <= 100],
-            "Intermediate Water (100-1000m)": self.df[(self.df['depth'] > 100) & (self.df['depth'] <= 1000)],
-            "Deep Water (>1000m)": self.df[self.df['depth'] > 1000]
-        }
+        # One binning pass and one aggregation instead of a filtered copy per layer
+        layers = pd.cut(
+            self.df['depth'],
+            bins=[-np.inf, 100, 1000, np.inf],
+            labels=["Surface Water (0-100m)", "Intermediate Water (100-1000m)", "Deep Water (>1000m)"]
+        )
+        water_masses = self.df.groupby(layers, observed=True).agg(
+            temperature=('temperature', 'mean'),
+            salinity=('salinity', 'mean'),
+            count=('depth', 'size')
+        )
         
-        for name, data in water_masses.items():
-            if not data.empty:
-                analysis += (f"📊 {name}:\n"
-                             f"   🌡️ Avg Temp: {data['temperature'].mean():.2f}°C\n"
-                             f"   🧂 Avg Salinity: {data['salinity'].mean():.2f} PSU\n"
-                             f"   📈 Data Points: {len(data)}\n\n")
-        return analysis
\ No newline at end of file
+        for name, data in water_masses.iterrows():
+            analysis += (f"📊 {name}:\n"
+                         f"   🌡️ Avg Temp: {data['temperature']:.2f}°C\n"
+                         f"   🧂 Avg Salinity: {data['salinity']:.2f} PSU\n"
+                         f"   📈 Data Points: {int(data['count'])}\n\n")
+        return analysis
@@ -3,6 +3,18 @@
 import os
 import google.generativeai as genai
 
+__all__ = ['OceanChatbot']
+
+# One model object shared by every region's chatbot
+_MODEL = None
+
+def _shared_model():
+    """Returns the app-wide Gemini model, creating it on first use."""
+    global _MODEL
+    if _MODEL is None:
+        _MODEL = genai.GenerativeModel("gemini-1.5-flash")
+    return _MODEL
+
 class OceanChatbot:
     """Intelligent chatbot for ocean data analysis."""
     
@@ -12,10 +24,12 @@ class OceanChatbot:
             raise ValueError("GEMINI_API_KEY environment variable not set.")
             
         genai.configure(api_key=api_key)
-        self.model = genai.GenerativeModel("gemini-1.5-flash")
+        self.model = _shared_model()
         self.predictor = predictor
         self.data_summary = data_summary or {}
         self.conversation_history = []
+        # The session's data and model context don't change, so build the prompt prefix once
+        self._system_prefix = self._build_system_prefix()
         
     def chat(self, user_message):
         """Main chat interface."""
@@ -35,6 +49,10 @@ class OceanChatbot:
     
     def _create_context_prompt(self, user_message):
         """Creates a context-aware prompt for the AI."""
+        return f"{self._system_prefix}\n\nUser Question: {user_message}\n\nYour Answer:"
+    
+    def _build_system_prefix(self):
+        """Builds the system prompt plus the data and model context."""
         system_prompt = """You are OceanGPT, an expert oceanographer and AI assistant specializing in ocean data analysis. You are helping users understand ARGO float data and oceanographic phenomena.
 always try to give the output in bullet points, and also try to be with the user input the do not try to extent or try to givr long output
 Your expertise includes:
@@ -65,8 +83,7 @@ Current Data Context:"""
             for param, metrics in self.predictor.model_metrics.items():
                 context_info += f"\n- {param.title()} Model: {metrics.get('model_type', 'Unknown')} (R² = {metrics.get('r2', 'N/A')})"
         
-        full_prompt = f"{system_prompt}{context_info}\n\nUser Question: {user_message}\n\nYour Answer:"
-        return full_prompt
+        return f"{system_prompt}{context_info}"
     
     def _extract_text(self, response):
         """Extracts text from Gemini response."""
@@ -38,7 +38,13 @@ CONFIG = {
         "test_size": 0.2,
         "random_state": 42,
         "n_estimators": 100,
-        "model_preference": "lightgbm"  # Options: "lightgbm", "xgboost", "randomforest"
+        "max_threads": 4,  # Thread cap for LightGBM/XGBoost training and batch prediction
+        "model_preference": "lightgbm"  # Options: "lightgbm", "xgboost", "randomforest" (unavailable ones fall back to HistGradientBoosting, whose importance chart uses permutation importance)
+    },
+    "session_settings": {
+        "max_loaded_regions": 2,  # Least recently used region is unloaded beyond this
+        "idle_timeout_seconds": 1800,  # Regions unused for this long are unloaded
+        "janitor_interval_seconds": 60
     },
     "visualization_settings": {
         "mapbox_style": "carto-positron",
@@ -2,12 +2,35 @@
 
 import os
 import json
+import hashlib
 import pickle
+import orjson
 import pandas as pd
 from datetime import datetime, timedelta
 from pathlib import Path
 from .config import CONFIG
 
+try:
+    import pyarrow  # noqa: F401  (feather backend for pandas)
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Bump when the processed frame's columns or dtypes change so old caches are rebuilt
+CACHE_SCHEMA_VERSION = 2
+
+def compute_settings_hash(region_key) -> str:
+    """
+    Hash the region, data settings and schema so config or format changes invalidate
+    the cache. Saved models store the same hash, so they are retrained alongside it.
+    """
+    settings = {
+        'schema': CACHE_SCHEMA_VERSION,
+        'region': CONFIG['regions'][region_key]['bounds'],
+        'data_settings': CONFIG['data_settings']
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
 class DataCache:
     """Enhanced data caching system for processed ocean data."""
     
@@ -17,21 +40,35 @@ class DataCache:
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
         # Cache file paths
-        self.data_cache_path = self.cache_dir / 'processed_data.pkl'
+        # Feather (Arrow) when pyarrow is installed; pickle is read as a legacy fallback
+        self.pickle_cache_path = self.cache_dir / 'processed_data.pkl'
+        self.data_cache_path = self.cache_dir / 'processed_data.feather' if PYARROW_AVAILABLE else self.pickle_cache_path
         self.metadata_path = self.cache_dir / 'metadata.json'
         self.summary_path = self.cache_dir / 'summary.json'
         
         # Cache expiry (in days)
         self.cache_expiry_days = 7
+        
+        # Fingerprint of the settings the cached data was produced with
+        self.settings_hash = compute_settings_hash(region_key)
+    
+    def _existing_data_path(self):
+        """Returns the cached data file to read, preferring feather over a legacy pickle."""
+        for path in (self.data_cache_path, self.pickle_cache_path):
+            if path.exists():
+                return path
+        return None
     
     def is_cache_valid(self) -> bool:
         """Check if cached data exists and is not expired."""
-        if not (self.data_cache_path.exists() and self.metadata_path.exists()):
+        if not (self._existing_data_path() and self.metadata_path.exists()):
             return False
         
         try:
-            with open(self.metadata_path, 'r') as f:
-                metadata = json.load(f)
+            metadata = orjson.loads(self.metadata_path.read_bytes())
+            
+            if metadata.get('settings_hash') != self.settings_hash:
+                return False
             
             cached_time = datetime.fromisoformat(metadata['cached_at'])
             expiry_time = cached_time + timedelta(days=self.cache_expiry_days)
@@ -44,16 +81,21 @@ class DataCache:
         """Save processed data and summary to cache."""
         try:
             # Save DataFrame
-            df.to_pickle(self.data_cache_path)
+            if PYARROW_AVAILABLE:
+                df.reset_index(drop=True).to_feather(self.data_cache_path, compression='lz4')
+                if self.pickle_cache_path.exists():
+                    self.pickle_cache_path.unlink()
+            else:
+                df.to_pickle(self.data_cache_path)
             
             # Save summary
-            with open(self.summary_path, 'w') as f:
-                json.dump(summary, f, indent=2)
+            self.summary_path.write_bytes(orjson.dumps(summary, option=orjson.OPT_SERIALIZE_NUMPY))
             
             # Save metadata
             metadata = {
                 'cached_at': datetime.now().isoformat(),
                 'region_key': self.region_key,
+                'settings_hash': self.settings_hash,
                 'data_points': len(df),
                 'date_range': {
                     'start': df['date'].min().isoformat() if not df.empty and 'date' in df.columns else None,
@@ -61,8 +103,7 @@ class DataCache:
                 }
             }
             
-            with open(self.metadata_path, 'w') as f:
-                json.dump(metadata, f, indent=2)
+            self.metadata_path.write_bytes(orjson.dumps(metadata))
             
             print(f"💾 Data cached for {self.region_key} ({len(df)} records)")
             return True
@@ -78,13 +119,16 @@ class DataCache:
                 return pd.DataFrame(), {}
             
             # Load DataFrame
-            df = pd.read_pickle(self.data_cache_path)
+            data_path = self._existing_data_path()
+            if data_path.suffix == '.feather':
+                df = pd.read_feather(data_path)
+            else:
+                df = pd.read_pickle(data_path)
             
             # Load summary
             summary = {}
             if self.summary_path.exists():
-                with open(self.summary_path, 'r') as f:
-                    summary = json.load(f)
+                summary = orjson.loads(self.summary_path.read_bytes())
             
             print(f"📂 Loaded cached data for {self.region_key} ({len(df)} records)")
             return df, summary
@@ -96,7 +140,7 @@ class DataCache:
     def clear_cache(self):
         """Clear all cached data for this region."""
         try:
-            for file_path in [self.data_cache_path, self.metadata_path, self.summary_path]:
+            for file_path in [self.data_cache_path, self.pickle_cache_path, self.metadata_path, self.summary_path]:
                 if file_path.exists():
                     file_path.unlink()
             print(f"🗑️ Cache cleared for {self.region_key}")
@@ -109,8 +153,7 @@ class DataCache:
             return {'cached': False}
         
         try:
-            with open(self.metadata_path, 'r') as f:
-                metadata = json.load(f)
+            metadata = orjson.loads(self.metadata_path.read_bytes())
             
             return {
                 'cached': True,
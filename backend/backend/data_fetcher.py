@@ -3,9 +3,13 @@
 import pandas as pd
 import numpy as np
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 from argopy import DataFetcher as ArgoDataFetcher
 from .config import CONFIG # Relative import
 
+# The only ARGO variables the analysis uses; everything else is left in xarray
+ARGO_VARIABLES = ['PLATFORM_NUMBER', 'CYCLE_NUMBER', 'TIME', 'LATITUDE', 'LONGITUDE', 'PRES', 'TEMP', 'PSAL']
+
 class EnhancedArgoDataFetcher:
     """Enhanced ARGO data fetcher with multiple fallback strategies"""
     
@@ -17,26 +21,13 @@ class EnhancedArgoDataFetcher:
         if months is None:
             months = CONFIG["data_settings"]["months"]
             
+        # Years are independent network round-trips, so fetch them concurrently.
+        # Each year yields a list of frames; they are concatenated once, here.
         all_data = []
-        for year in years:
-            print(f"Fetching data for {year}...")
-            # Strategy 1: Try monthly fetching first
-            year_data = self._fetch_monthly_data(region_bounds, year, months)
-            if year_data is not None and not year_data.empty:
-                all_data.append(year_data)
-                continue
-                
-            # Strategy 2: Try broader time range
-            year_data = self._fetch_broader_range(region_bounds, year)
-            if year_data is not None and not year_data.empty:
-                all_data.append(year_data)
-                continue
-                
-            # Strategy 3: Generate synthetic/sample data for demonstration
-            print(f"  No real data found for {year}, generating sample data...")
-            synthetic_data = self._generate_sample_data(region_bounds, year, months)
-            if synthetic_data is not None:
-                all_data.append(synthetic_data)
+        if years:
+            with ThreadPoolExecutor(max_workers=len(years)) as pool:
+                year_results = pool.map(lambda year: self._fetch_one_year(region_bounds, year, months), years)
+                all_data = [frame for year_frames in year_results for frame in year_frames]
         
         if all_data:
             combined_df = pd.concat(all_data, ignore_index=True)
@@ -46,8 +37,32 @@ class EnhancedArgoDataFetcher:
             print("❌ No data could be fetched or generated.")
             return pd.DataFrame()
     
+    @staticmethod
+    def _to_dataframe(ds):
+        """Converts only the needed ARGO variables to a flat DataFrame."""
+        keep = [name for name in ARGO_VARIABLES if name in ds.variables]
+        return ds[keep].to_dataframe().reset_index()
+    
+    def _fetch_one_year(self, region_bounds, year, months):
+        """Walks the fallback strategies for a single year and returns its frames."""
+        print(f"Fetching data for {year}...")
+        # Strategy 1: Try monthly fetching first
+        monthly_frames = self._fetch_monthly_data(region_bounds, year, months)
+        if monthly_frames:
+            return monthly_frames
+            
+        # Strategy 2: Try broader time range
+        year_data = self._fetch_broader_range(region_bounds, year)
+        if year_data is not None and not year_data.empty:
+            return [year_data]
+            
+        # Strategy 3: Generate synthetic/sample data for demonstration
+        print(f"  No real data found for {year}, generating sample data...")
+        synthetic_data = self._generate_sample_data(region_bounds, year, months)
+        return [synthetic_data] if synthetic_data is not None else []
+    
     def _fetch_monthly_data(self, region_bounds, year, months):
-        """Tries to fetch data month by month."""
+        """Tries to fetch data month by month; returns the non-empty monthly frames."""
         monthly_data = []
         for month in months:
             try:
@@ -72,7 +87,7 @@ class EnhancedArgoDataFetcher:
                 ds = argo_loader.to_xarray()
                 
                 if 'N_PROF' in ds.sizes and ds.sizes['N_PROF'] > 0:
-                    df_month = ds.to_dataframe().reset_index()
+                    df_month = self._to_dataframe(ds)
                     monthly_data.append(df_month)
                     print(f"  ✅ Found data for {year}-{month:02d}")
                 
@@ -80,9 +95,7 @@ class EnhancedArgoDataFetcher:
                 print(f"  ❌ Error fetching {year}-{month:02d}: {str(e)[:100]}...")
                 continue
         
-        if monthly_data:
-            return pd.concat(monthly_data, ignore_index=True)
-        return None
+        return monthly_data
     
     def _fetch_broader_range(self, region_bounds, year):
         """Tries broader date ranges."""
@@ -99,7 +112,7 @@ class EnhancedArgoDataFetcher:
             
             if 'N_PROF' in ds.sizes and ds.sizes['N_PROF'] > 0:
                 print(f"  ✅ Found data using broader range for {year}")
-                return ds.to_dataframe().reset_index()
+                return self._to_dataframe(ds)
                 
         except Exception as e:
             print(f"  ❌ Broader range failed for {year}: {str(e)[:100]}...")
@@ -109,47 +122,53 @@ class EnhancedArgoDataFetcher:
     def _generate_sample_data(self, region_bounds, year, months):
         """Generates realistic sample data for demonstration."""
         lon_min, lon_max, lat_min, lat_max = region_bounds
-        n_profiles = np.random.randint(30, 80)  # More profiles for better visualization
-        data_points = []
+        rng = np.random.default_rng()
+        n_profiles = rng.integers(30, 80)  # More profiles for better visualization
         depths = np.array([0, 5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500, 750, 1000, 1500, 2000])
 
-        for i in range(n_profiles):
-            # Create more realistic geographic distribution
-            lat = np.random.uniform(lat_min + 1, lat_max - 1)  # Avoid edges
-            lon = np.random.uniform(lon_min + 1, lon_max - 1)
-            month = np.random.choice(months)
-            date = datetime(year, month, np.random.randint(1, 28))
-            
-            # Generate multiple depth measurements per profile
-            n_depths = np.random.randint(8, 15)  # 8-15 depth measurements per profile
-            profile_depths = np.sort(np.random.choice(depths, n_depths, replace=False))
-            
-            for depth in profile_depths:
-                # More realistic temperature profile
-                if depth <= 50:
-                    temp = 28 - depth * 0.1 + np.random.normal(0, 0.8)
-                elif depth <= 200:
-                    temp = 23 - (depth - 50) * 0.02 + np.random.normal(0, 0.5)
-                else:
-                    temp = 19 - (depth - 200) * 0.003 + np.random.normal(0, 0.3)
-                
-                # More realistic salinity profile
-                if depth <= 100:
-                    salinity = 34.5 + np.random.normal(0, 0.4)
-                else:
-                    salinity = 34.8 + np.random.normal(0, 0.2)
-                
-                data_points.append({
-                    'PLATFORM_NUMBER': f'SAMPLE_{i:04d}',
-                    'CYCLE_NUMBER': 1, 
-                    'TIME': date,
-                    'LATITUDE': lat, 
-                    'LONGITUDE': lon, 
-                    'PRES': depth,
-                    'TEMP': max(temp, 1.5), 
-                    'PSAL': max(salinity, 32.0)
-                })
-        
-        df = pd.DataFrame(data_points)
+        # Create more realistic geographic distribution
+        lats = rng.uniform(lat_min + 1, lat_max - 1, n_profiles)  # Avoid edges
+        lons = rng.uniform(lon_min + 1, lon_max - 1, n_profiles)
+        dates = pd.to_datetime({
+            'year': np.full(n_profiles, year),
+            'month': rng.choice(months, n_profiles),
+            'day': rng.integers(1, 28, n_profiles),
+        })
+
+        # 8-15 distinct depth measurements per profile: rank a random key per
+        # (profile, depth) cell and keep the lowest ranks. The depth grid is
+        # already sorted, so the kept cells come out in depth order.
+        n_depths = rng.integers(8, 15, n_profiles)
+        ranks = rng.random((n_profiles, depths.size)).argsort(axis=1).argsort(axis=1)
+        profile_idx, depth_idx = np.nonzero(ranks < n_depths[:, None])
+        depth = depths[depth_idx]
+        n_points = depth.size
+
+        # More realistic temperature profile
+        temp = np.select(
+            [depth <= 50, depth <= 200],
+            [28 - depth * 0.1 + rng.normal(0, 0.8, n_points),
+             23 - (depth - 50) * 0.02 + rng.normal(0, 0.5, n_points)],
+            19 - (depth - 200) * 0.003 + rng.normal(0, 0.3, n_points),
+        )
+
+        # More realistic salinity profile
+        salinity = np.where(
+            depth <= 100,
+            34.5 + rng.normal(0, 0.4, n_points),
+            34.8 + rng.normal(0, 0.2, n_points),
+        )
+
+        platform_numbers = np.array([f'SAMPLE_{i:04d}' for i in range(n_profiles)])
+        df = pd.DataFrame({
+            'PLATFORM_NUMBER': platform_numbers[profile_idx],
+            'CYCLE_NUMBER': 1,
+            'TIME': dates.to_numpy()[profile_idx],
+            'LATITUDE': lats[profile_idx],
+            'LONGITUDE': lons[profile_idx],
+            'PRES': depth,
+            'TEMP': np.maximum(temp, 1.5),
+            'PSAL': np.maximum(salinity, 32.0),
+        })
         print(f"  ✅ Generated {len(df)} sample data points for {year}")
         return df
\ No newline at end of file
@@ -0,0 +1,25 @@
+# /backend/feature_kernels.py
+# numba-compiled helpers for the predictor; importing this module requires numba.
+
+import math
+import numba
+from numba import njit, prange
+
+# The TBB layer can hang at interpreter exit; OpenMP is also safe across request threads
+numba.config.THREADING_LAYER_PRIORITY = ['omp', 'tbb', 'workqueue']
+
+@njit(parallel=True, cache=True)
+def fill_features(lat, lon, depth, month, out):
+    """Fills out[i] with the 7 model features for each point, in one parallel pass."""
+    month_step = 2 * math.pi / 12
+    for i in prange(lat.shape[0]):
+        lat_rad = math.radians(lat[i])
+        lon_rad = math.radians(lon[i])
+        month_angle = month_step * month[i]
+        out[i, 0] = math.sin(lat_rad)
+        out[i, 1] = math.cos(lat_rad)
+        out[i, 2] = math.sin(lon_rad)
+        out[i, 3] = math.cos(lon_rad)
+        out[i, 4] = math.log1p(depth[i])
+        out[i, 5] = math.sin(month_angle)
+        out[i, 6] = math.cos(month_angle)
@@ -1,28 +1,86 @@
 import os
 import json
+import math
+import pickle
+import importlib
+import warnings
 import joblib
-import pandas as pd
 import numpy as np
 from datetime import datetime
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
-from sklearn.metrics import mean_absolute_error, r2_score
-import plotly.express as px
 from .config import CONFIG # Relative import
 
-# Advanced ML library imports with availability checks
-try:
-    import lightgbm as lgb
-    LIGHTGBM_AVAILABLE = True
-except ImportError:
-    LIGHTGBM_AVAILABLE = False
+# sklearn, plotly and the boosting libraries are imported on first use so that
+# importing this module (and booting an API worker) stays cheap.
+_optional_modules = {}
+
+def _optional_import(name):
+    """Imports an optional ML library once; returns None when it is not installed."""
+    if name not in _optional_modules:
+        try:
+            _optional_modules[name] = importlib.import_module(name)
+        except ImportError:
+            _optional_modules[name] = None
+    return _optional_modules[name]
 
 try:
-    import xgboost as xgb
-    XGBOOST_AVAILABLE = True
+    import lz4  # noqa: F401  (enables joblib's lz4 compressor)
+    MODEL_COMPRESSION = ('lz4', 3)
 except ImportError:
-    XGBOOST_AVAILABLE = False
+    MODEL_COMPRESSION = ('zlib', 3)
+
+# Only HistGradientBoosting keeps its trees as plain numpy node arrays that stay
+# memory-mapped after loading, so only it is stored uncompressed and shared through the
+# page cache by every worker. Boosters pickle as an opaque blob, and RandomForest's
+# Tree.__setstate__ copies its arrays, so those stay compressed.
+MMAP_MODEL_TYPES = ('HistGradientBoostingRegressor',)
+
+def _load_joblib(path):
+    """Loads a joblib file, memory-mapping its numpy arrays when it is uncompressed."""
+    with warnings.catch_warnings():
+        warnings.filterwarnings('ignore', message='mmap_mode .* is not compatible with compressed file')
+        return joblib.load(path, mmap_mode='r')
+
+# Features and targets carry ~3 significant digits; float32 halves their memory traffic
+FEATURE_DTYPE = np.float32
+
+# Angle conversions used by the cyclical features
+DEG_TO_RAD = math.pi / 180
+MONTH_TO_RAD = 2 * math.pi / 12
+
+# Below this many rows the numpy path is cheaper than a parallel kernel launch
+NUMBA_MIN_ROWS = 1024
+
+def _feature_kernel():
+    """Returns the numba feature kernel, or None when numba is not installed."""
+    kernels = _optional_import(f'{__package__}.feature_kernels')
+    return kernels.fill_features if kernels is not None else None
+
+class FeatureScaler:
+    """Standardizes features with a stored mean and scale (same attributes as sklearn's StandardScaler)."""
+    
+    def __init__(self, mean, scale):
+        self.mean_ = mean
+        self.scale_ = scale
+    
+    @classmethod
+    def fit(cls, X):
+        """Computes per-column mean and standard deviation; constant columns get a scale of 1."""
+        mean = X.mean(axis=0, dtype=np.float64)
+        scale = X.std(axis=0, dtype=np.float64)
+        scale[scale == 0] = 1.0
+        return cls(mean, scale)
+    
+    def transform(self, X):
+        return (X - self.mean_) / self.scale_
+    
+    def save(self, path):
+        """Writes the mean and scale arrays to an uncompressed .npz file."""
+        np.savez(path, mean=self.mean_, scale=self.scale_)
+    
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as arrays:
+            return cls(arrays['mean'], arrays['scale'])
 
 class AdvancedOceanPredictor:
     """Advanced ML models with model persistence and explainability."""
@@ -32,47 +90,113 @@ class AdvancedOceanPredictor:
         self.model_dir = os.path.join('models', region_key)
         self.models = {}
         self.scalers = {}
+        self._scaler_coefs = {}  # param -> (scaler, mean, 1/scale), refreshed when a scaler is replaced
         self.feature_names = ['lat_sin', 'lat_cos', 'lon_sin', 'lon_cos', 'depth_log', 'month_sin', 'month_cos']
         self.model_metrics = {}
+        self.model_importances = {}
         self.model_preference = model_preference
         self.models_trained = False
+        # Models trained on data fetched with other settings are stale; see load_models
+        from .data_cache import compute_settings_hash
+        self.settings_hash = compute_settings_hash(region_key)
         os.makedirs(self.model_dir, exist_ok=True)
         
     def _get_model(self):
         """Gets the appropriate model based on preference and availability."""
-        if self.model_preference == "lightgbm" and LIGHTGBM_AVAILABLE:
-            return lgb.LGBMRegressor(random_state=CONFIG["model_settings"]["random_state"], n_jobs=-1, verbose=-1)
-        elif self.model_preference == "xgboost" and XGBOOST_AVAILABLE:
-            return xgb.XGBRegressor(random_state=CONFIG["model_settings"]["random_state"], n_jobs=-1, verbosity=0)
-        else:
-            if self.model_preference != "randomforest":
-                print(f"⚠️ {self.model_preference} not available, falling back to RandomForest.")
+        # 7 features and a few thousand rows: more threads only add wake-up overhead
+        n_jobs = min(CONFIG["model_settings"]["max_threads"], os.cpu_count() or 1)
+        lgb = _optional_import('lightgbm') if self.model_preference == "lightgbm" else None
+        xgb = _optional_import('xgboost') if self.model_preference == "xgboost" else None
+        if lgb is not None:
+            return lgb.LGBMRegressor(random_state=CONFIG["model_settings"]["random_state"], n_jobs=n_jobs, verbose=-1)
+        elif xgb is not None:
+            return xgb.XGBRegressor(random_state=CONFIG["model_settings"]["random_state"], n_jobs=n_jobs, verbosity=0)
+        elif self.model_preference == "randomforest":
+            from sklearn.ensemble import RandomForestRegressor
             return RandomForestRegressor(
                 n_estimators=CONFIG["model_settings"]["n_estimators"],
                 random_state=CONFIG["model_settings"]["random_state"], n_jobs=-1
             )
+        else:
+            # Histogram-based boosting ships with scikit-learn, so it is always available
+            print(f"⚠️ {self.model_preference} not available, falling back to HistGradientBoosting.")
+            from sklearn.ensemble import HistGradientBoostingRegressor
+            return HistGradientBoostingRegressor(
+                max_iter=CONFIG["model_settings"]["n_estimators"],
+                random_state=CONFIG["model_settings"]["random_state"], early_stopping=True
+            )
         
     def _prepare_features(self, df):
         """Enhanced feature engineering with cyclical encoding."""
-        features = df[['latitude', 'longitude', 'depth', 'month']].copy()
-        features['lat_sin'] = np.sin(np.radians(features['latitude']))
-        features['lat_cos'] = np.cos(np.radians(features['latitude']))
-        features['lon_sin'] = np.sin(np.radians(features['longitude']))
-        features['lon_cos'] = np.cos(np.radians(features['longitude']))
-        features['month_sin'] = np.sin(2 * np.pi * features['month'] / 12)
-        features['month_cos'] = np.cos(2 * np.pi * features['month'] / 12)
-        features['depth_log'] = np.log1p(features['depth'])
-        return features[self.feature_names]
+        # Cast once at the boundary so nullable/Arrow columns arrive as plain float64 with NaN
+        lat, lon, depth, month = (df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                                  for column in ('latitude', 'longitude', 'depth', 'month'))
+        return self._feature_matrix(lat, lon, depth, month)
+    
+    def _feature_matrix(self, lat, lon, depth, month):
+        """Computes the feature columns straight into one (n, 7) float32 array, in feature_names order."""
+        features = np.empty((len(lat), len(self.feature_names)), dtype=FEATURE_DTYPE)
+        kernel = _feature_kernel() if len(lat) >= NUMBA_MIN_ROWS else None
+        if kernel is not None:
+            kernel(*(np.ascontiguousarray(a, dtype=np.float64) for a in (lat, lon, depth, month)), features)
+            return features
+        lat_rad = np.multiply(lat, DEG_TO_RAD, dtype=np.float64)
+        np.sin(lat_rad, out=features[:, 0])
+        np.cos(lat_rad, out=features[:, 1])
+        lon_rad = np.multiply(lon, DEG_TO_RAD, dtype=np.float64)
+        np.sin(lon_rad, out=features[:, 2])
+        np.cos(lon_rad, out=features[:, 3])
+        np.log1p(depth, out=features[:, 4], dtype=np.float64)
+        month_angle = np.multiply(month, MONTH_TO_RAD, dtype=np.float64)
+        np.sin(month_angle, out=features[:, 5])
+        np.cos(month_angle, out=features[:, 6])
+        return features
+    
+    def _point_features(self, lat, lon, depth, month):
+        """Feature row for a single point, computed without pandas (same order as feature_names)."""
+        lat_rad, lon_rad = lat * DEG_TO_RAD, lon * DEG_TO_RAD
+        month_angle = month * MONTH_TO_RAD
+        features = np.empty((1, len(self.feature_names)), dtype=FEATURE_DTYPE)
+        features[0] = [math.sin(lat_rad), math.cos(lat_rad), math.sin(lon_rad), math.cos(lon_rad),
+                       math.log1p(depth), math.sin(month_angle), math.cos(month_angle)]
+        return features
+    
+    def _scale(self, param_name, features):
+        """Applies a fitted scaler as a precomputed affine map, skipping any per-call input validation."""
+        scaler = self.scalers[param_name]
+        coefs = self._scaler_coefs.get(param_name)
+        if coefs is None or coefs[0] is not scaler:
+            coefs = (scaler, scaler.mean_.astype(FEATURE_DTYPE), (1.0 / scaler.scale_).astype(FEATURE_DTYPE))
+            self._scaler_coefs[param_name] = coefs
+        scaled = features - coefs[1]
+        scaled *= coefs[2]
+        return scaled
+    
+    @staticmethod
+    def _predict_raw(model, X):
+        """
+        Runs the compiled booster directly when there is one, skipping the sklearn
+        wrapper's per-call validation; other models use their regular predict.
+        """
+        library = type(model).__module__.split('.')[0]
+        if library == 'lightgbm':
+            # A single row gains nothing from OpenMP; keep it on the calling thread
+            return model.booster_.predict(X, num_threads=1) if len(X) == 1 else model.booster_.predict(X)
+        if library == 'xgboost':
+            return model.get_booster().inplace_predict(X)
+        return model.predict(X)
     
     def train_models(self, df):
         """Trains advanced models for multiple parameters."""
         print(f"🤖 Training predictive models for {self.region_key} using {self.model_preference.upper()}...")
         features = self._prepare_features(df)
+        # Shared by every target, so the feature matrix is only scanned once
+        valid_rows = np.isfinite(features).all(axis=1)
         
         if 'temperature' in df.columns:
-            self._train_single_model(features, df['temperature'], 'temperature')
+            self._train_single_model(features, df['temperature'], 'temperature', valid_rows)
         if 'salinity' in df.columns:
-            self._train_single_model(features, df['salinity'], 'salinity')
+            self._train_single_model(features, df['salinity'], 'salinity', valid_rows)
         
         if self.models:
             self.models_trained = True
@@ -83,67 +207,119 @@ class AdvancedOceanPredictor:
             
         return self.model_metrics
     
-    def _train_single_model(self, features, target, param_name):
-        """Trains a single advanced model."""
-        mask = ~(features.isna().any(axis=1) | target.isna())
+    def _train_single_model(self, features, target, param_name, valid_rows):
+        """Trains a single advanced model on the rows where features and target are finite."""
+        target = np.asarray(target, dtype=FEATURE_DTYPE)
+        mask = valid_rows & np.isfinite(target)
         X_clean, y_clean = features[mask], target[mask]
         
         if len(X_clean) < 50:
             print(f"❌ Not enough data to train {param_name} model (requires at least 50 points).")
             return
         
-        self.scalers[param_name] = StandardScaler()
-        X_scaled = self.scalers[param_name].fit_transform(X_clean)
+        from sklearn.metrics import mean_absolute_error, r2_score
         
-        X_train, X_test, y_train, y_test = train_test_split(
-            X_scaled, y_clean, 
-            test_size=CONFIG["model_settings"]["test_size"],
-            random_state=CONFIG["model_settings"]["random_state"]
-        )
+        # One shuffled index for the split; scaling statistics come from the training rows
+        # only and are applied in place on the (already copied) clean matrix
+        rng = np.random.default_rng(CONFIG["model_settings"]["random_state"])
+        order = rng.permutation(len(X_clean))
+        n_test = math.ceil(len(X_clean) * CONFIG["model_settings"]["test_size"])
+        train_idx, test_idx = order[n_test:], order[:n_test]
+        
+        scaler = FeatureScaler.fit(X_clean[train_idx])
+        self.scalers[param_name] = scaler
+        np.subtract(X_clean, scaler.mean_.astype(FEATURE_DTYPE), out=X_clean)
+        np.divide(X_clean, scaler.scale_.astype(FEATURE_DTYPE), out=X_clean)
+        
+        X_train, X_test = X_clean[train_idx], X_clean[test_idx]
+        y_train, y_test = y_clean[train_idx], y_clean[test_idx]
         
         model = self._get_model()
         model.fit(X_train, y_train)
         self.models[param_name] = model
         
         y_pred = model.predict(X_test)
+        if hasattr(model, 'feature_importances_'):
+            importances = model.feature_importances_
+        else:
+            # HistGradientBoosting has no built-in importances; measure them on the held-out rows
+            from sklearn.inspection import permutation_importance
+            importances = permutation_importance(
+                model, X_test, y_test, n_repeats=5,
+                random_state=CONFIG["model_settings"]["random_state"]
+            ).importances_mean
+        self.model_importances[param_name] = [float(v) for v in importances]
         self.model_metrics[param_name] = {
-            'mae': round(mean_absolute_error(y_test, y_pred), 3),
-            'r2': round(r2_score(y_test, y_pred), 3),
+            'mae': round(float(mean_absolute_error(y_test, y_pred)), 3),
+            'r2': round(float(r2_score(y_test, y_pred)), 3),
             'model_type': type(model).__name__
         }
         print(f"  📊 {param_name}: R² = {self.model_metrics[param_name]['r2']:.3f}")
 
+    def _importance_figure_json(self, param_name, importances):
+        """Builds the feature importance bar chart as Plotly JSON."""
+        import plotly.graph_objects as go
+
+        order = np.argsort(importances, kind='stable')
+        fig = go.Figure(go.Bar(
+            x=[float(importances[i]) for i in order],
+            y=[self.feature_names[i] for i in order],
+            orientation='h'
+        ))
+        fig.update_layout(
+            title=f'Feature Importance for {param_name.title()} Prediction',
+            xaxis_title='importance', yaxis_title='feature'
+        )
+        return fig.to_json()
+
     def plot_feature_importance(self, param_name='temperature'):
         """Generates JSON for a feature importance plot."""
-        if param_name not in self.models: return None
-        model = self.models[param_name]
-        
-        if hasattr(model, 'feature_importances_'):
+        cached_path = os.path.join(self.model_dir, f'feature_importance_{param_name}.json')
+        if os.path.exists(cached_path):
+            with open(cached_path, 'r') as f:
+                return f.read()
+
+        importances = self.model_importances.get(param_name)
+        if importances is None:
+            # Metadata written before importances were stored; read them off the model
+            model = self.models.get(param_name)
+            if model is None or not hasattr(model, 'feature_importances_'):
+                return None
             importances = model.feature_importances_
-        else:
-            return None
-        
-        feature_importance_df = pd.DataFrame({
-            'feature': self.feature_names,
-            'importance': importances
-        }).sort_values('importance', ascending=True)
-        
-        fig = px.bar(
-            feature_importance_df, x='importance', y='feature', orientation='h',
-            title=f'Feature Importance for {param_name.title()} Prediction'
-        )
-        return fig.to_json()
+        return self._importance_figure_json(param_name, importances)
 
     def _save_models(self):
         """Saves trained models and scalers to disk."""
         try:
             for param_name in self.models:
-                joblib.dump(self.models[param_name], os.path.join(self.model_dir, f'{param_name}_model.joblib'))
-                joblib.dump(self.scalers[param_name], os.path.join(self.model_dir, f'{param_name}_scaler.joblib'))
+                # The scaler is two 7-float arrays; plain .npz loads far faster than a pickle
+                self.scalers[param_name].save(os.path.join(self.model_dir, f'{param_name}_scaler.npz'))
+                model = self.models[param_name]
+                bundle = {'model': model}
+                compress = 0 if type(model).__name__ in MMAP_MODEL_TYPES else MODEL_COMPRESSION
+                joblib.dump(bundle, os.path.join(self.model_dir, f'{param_name}.joblib'),
+                            compress=compress, protocol=pickle.HIGHEST_PROTOCOL)
+                for legacy_name in (f'{param_name}_model.joblib', f'{param_name}_scaler.joblib'):
+                    legacy_path = os.path.join(self.model_dir, legacy_name)
+                    if os.path.exists(legacy_path):
+                        os.remove(legacy_path)
             
-            metadata = {'metrics': self.model_metrics, 'trained_date': datetime.now().isoformat()}
+            metadata = {
+                'metrics': self.model_metrics,
+                'importances': self.model_importances,
+                'settings_hash': self.settings_hash,
+                'trained_date': datetime.now().isoformat(),
+            }
             with open(os.path.join(self.model_dir, 'metadata.json'), 'w') as f:
                 json.dump(metadata, f, indent=2)
+            # The chart only changes when the models do, so render it once here
+            for param_name in self.models:
+                figure_path = os.path.join(self.model_dir, f'feature_importance_{param_name}.json')
+                if param_name in self.model_importances:
+                    with open(figure_path, 'w') as f:
+                        f.write(self._importance_figure_json(param_name, self.model_importances[param_name]))
+                elif os.path.exists(figure_path):
+                    os.remove(figure_path)
             print(f"💾 Models saved to {self.model_dir}")
         except Exception as e:
             print(f"⚠️ Could not save models: {e}")
@@ -157,15 +333,31 @@ class AdvancedOceanPredictor:
 
             with open(metadata_path, 'r') as f:
                 metadata = json.load(f)
+            if metadata.get('settings_hash') != self.settings_hash:
+                print(f"♻️ Saved models for {self.region_key} do not match the current data settings; ignoring them.")
+                return False
             self.model_metrics = metadata.get('metrics', {})
+            self.model_importances = metadata.get('importances', {})
             
             loaded_a_model = False
             for param_name in ['temperature', 'salinity']:
+                bundle_path = os.path.join(self.model_dir, f'{param_name}.joblib')
                 model_path = os.path.join(self.model_dir, f'{param_name}_model.joblib')
                 scaler_path = os.path.join(self.model_dir, f'{param_name}_scaler.joblib')
+                scaler_npz_path = os.path.join(self.model_dir, f'{param_name}_scaler.npz')
                 
-                if os.path.exists(model_path) and os.path.exists(scaler_path):
-                    self.models[param_name] = joblib.load(model_path)
+                if os.path.exists(bundle_path):
+                    bundle = _load_joblib(bundle_path)
+                    self.models[param_name] = bundle['model']
+                    if os.path.exists(scaler_npz_path):
+                        self.scalers[param_name] = FeatureScaler.load(scaler_npz_path)
+                    else:
+                        # Bundles saved before scalers moved to .npz carry the scaler inline
+                        self.scalers[param_name] = bundle['scaler']
+                    loaded_a_model = True
+                elif os.path.exists(model_path) and os.path.exists(scaler_path):
+                    # Layout used before models and scalers were bundled
+                    self.models[param_name] = _load_joblib(model_path)
                     self.scalers[param_name] = joblib.load(scaler_path)
                     loaded_a_model = True
 
@@ -184,15 +376,35 @@ class AdvancedOceanPredictor:
         if not self.models_trained:
             raise Exception("Models not trained or loaded yet.")
             
-        features_df = pd.DataFrame([{'latitude': lat, 'longitude': lon, 'depth': depth, 'month': month}])
-        features = self._prepare_features(features_df)
+        features = self._point_features(lat, lon, depth, month)
         
         predictions = {}
         for param_name, model in self.models.items():
             if param_name in self.scalers:
-                X_scaled = self.scalers[param_name].transform(features)
-                pred = model.predict(X_scaled)[0]
+                X_scaled = self._scale(param_name, features)
+                pred = self._predict_raw(model, X_scaled)[0]
                 predictions[f'predicted_{param_name}'] = round(float(pred), 2)
                 predictions[f'{param_name}_confidence'] = self.model_metrics.get(param_name, {}).get('r2', 0)
         
+        return predictions
+
+    def predict_batch(self, lats, lons, depths, months):
+        """
+        Predicts ocean conditions for many points with one model call per parameter.
+        Scalar depth or month values are broadcast across all points.
+        """
+        if not self.models_trained:
+            raise Exception("Models not trained or loaded yet.")
+        
+        lats, lons, depths, months = np.broadcast_arrays(lats, lons, depths, months)
+        features = self._feature_matrix(lats, lons, depths, months)
+        
+        predictions = {}
+        for param_name, model in self.models.items():
+            if param_name in self.scalers:
+                X_scaled = self._scale(param_name, features)
+                preds = self._predict_raw(model, X_scaled)
+                predictions[f'predicted_{param_name}'] = np.round(preds.astype(float), 2).tolist()
+                predictions[f'{param_name}_confidence'] = self.model_metrics.get(param_name, {}).get('r2', 0)
+        
         return predictions
\ No newline at end of file
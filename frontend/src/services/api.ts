@@ -41,6 +41,13 @@ export interface ModelStatusResponse {
   model_status: Record<string, ModelStatus>
 }
 
+export interface AnalysisStreamHandlers {
+  onSummary?: (data: { summary: any; model_metrics: any }) => void
+  onVisualization?: (name: keyof VisualizationResponse['visualizations'], figure: string | null) => void
+  onDone?: () => void
+  onError?: (detail: string) => void
+}
+
 export interface ApiError {
   detail: string
 }
@@ -156,6 +163,31 @@ class ApiService {
   async getModelStatus(): Promise<ModelStatusResponse> {
     return this.request<ModelStatusResponse>('/api/model_status')
   }
+
+  streamAnalysis(regionKey: string, handlers: AnalysisStreamHandlers): EventSource {
+    const source = new EventSource(
+      `${API_BASE_URL}/api/analyze/stream?region_key=${encodeURIComponent(regionKey)}`
+    )
+
+    source.addEventListener('summary', (event) => {
+      handlers.onSummary?.(JSON.parse((event as MessageEvent).data))
+    })
+    source.addEventListener('visualization', (event) => {
+      const { name, figure } = JSON.parse((event as MessageEvent).data)
+      handlers.onVisualization?.(name, figure)
+    })
+    source.addEventListener('done', () => {
+      source.close()
+      handlers.onDone?.()
+    })
+    source.addEventListener('error', (event) => {
+      source.close()
+      const data = (event as MessageEvent).data
+      handlers.onError?.(data ? JSON.parse(data).detail : 'Analysis stream failed')
+    })
+
+    return source
+  }
 }
 
 export const apiService = new ApiService()
\ No newline at end of file